@@ -1,4 +1,5 @@
 """Helper functions for ROS messaging"""
+import math
 from collections import namedtuple
 from typing import Optional
 
@@ -9,7 +10,7 @@ import tf2_ros
 from geographic_msgs.msg import BoundingBox
 from geometry_msgs.msg import Quaternion, TransformStamped
 from rclpy.node import Node
-from sensor_msgs.msg import TimeReference
+from sensor_msgs.msg import Image, TimeReference
 from std_msgs.msg import Header
 
 from .constants import FrameID
@@ -96,6 +97,51 @@ def bounding_box_to_bbox(msg: BoundingBox) -> BBox:
     )
 
 
+def image_to_array(msg: Image, channels: int) -> np.ndarray:
+    """Returns a view of 8-bit :class:`sensor_msgs.msg.Image` data as a numpy
+    array without copying it
+
+    Alternative to :meth:`cv_bridge.CvBridge.imgmsg_to_cv2` for the hot path
+    when the message is already known to be 8-bit with the given number of
+    channels (e.g. ``mono8`` or ``8UC4``). Row padding is respected.
+
+    .. seealso::
+        :func:`.array_to_image`
+
+    :param msg: Image message with 8-bit channels
+    :param channels: Number of channels in the image
+    :return: Array of shape (height, width, channels) sharing memory with the
+        message data
+    """
+    array = np.frombuffer(msg.data, dtype=np.uint8).reshape(msg.height, msg.step)
+    return array[:, : msg.width * channels].reshape(msg.height, msg.width, channels)
+
+
+def array_to_image(array: np.ndarray, encoding: str) -> Image:
+    """Creates a :class:`sensor_msgs.msg.Image` from a C-contiguous 8-bit numpy
+    array
+
+    Alternative to :meth:`cv_bridge.CvBridge.cv2_to_imgmsg` that copies the
+    array buffer directly into the message data once instead of going through
+    an intermediate :class:`bytes` object.
+
+    .. seealso::
+        :func:`.image_to_array`
+
+    :param array: C-contiguous array of shape (height, width) or
+        (height, width, channels) and dtype uint8
+    :param encoding: Image encoding, e.g. ``mono8`` or ``8UC4``
+    :return: Image message with empty header
+    """
+    assert array.dtype == np.uint8 and array.flags.c_contiguous
+    msg = Image()
+    msg.height, msg.width = array.shape[0:2]
+    msg.encoding = encoding
+    msg.step = array.strides[0]
+    msg.data.frombytes(array)
+    return msg
+
+
 def create_transform_msg(
     stamp,
     parent_frame: FrameID,
@@ -190,8 +236,8 @@ def extract_yaw(q: Quaternion) -> float:
     :param q: A list containing the quaternion [qx, qy, qz, qw].
     :return: The yaw angle in degrees.
     """
-    enu_yaw = np.arctan2(2 * (q.w * q.z + q.x * q.y), 1 - 2 * (q.y**2 + q.z**2))
-    enu_yaw_deg = np.degrees(enu_yaw)
+    enu_yaw = math.atan2(2 * (q.w * q.z + q.x * q.y), 1 - 2 * (q.y * q.y + q.z * q.z))
+    enu_yaw_deg = math.degrees(enu_yaw)
 
     # Convert ENU yaw to heading with North as origin
     heading = 90.0 - enu_yaw_deg
@@ -209,8 +255,8 @@ def extract_roll(q: Quaternion) -> float:
         format
     :return: The roll angle in degrees
     """
-    roll = np.arctan2(2 * (q.w * q.x + q.y * q.z), 1 - 2 * (q.x**2 + q.y**2))
-    roll_deg = np.degrees(roll)
+    roll = math.atan2(2 * (q.w * q.x + q.y * q.z), 1 - 2 * (q.x * q.x + q.y * q.y))
+    roll_deg = math.degrees(roll)
 
     # Normalize to [0, 360) range
     roll_deg = (roll_deg + 360) % 360
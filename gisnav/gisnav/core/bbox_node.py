@@ -30,7 +30,8 @@ The below graph shows :class:`.BBoxNode` in the computational graph.
         camera_info -->|sensor_msgs/CameraInfo| BBoxNode
         bounding_box -->|geographic_msgs/BoundingBox| GISNode:::hidden.
 """
-from typing import Final, Optional
+from functools import lru_cache
+from typing import Final, Optional, Tuple
 
 import numpy as np
 import pyproj
@@ -183,33 +184,26 @@ class BBoxNode(Node):
                 [camera_info.width / 2, camera_info.height / 2],
             ]
 
-            # Project each point to the ground
-            ground_points = []
-            for pt in img_points:
-                u, v = pt
+            # Invert intrinsics once for all points
+            try:
+                intrinsics_inv = np.linalg.inv(intrinsics)
+            except np.linalg.LinAlgError as _:  # noqa: F841
+                self.get_logger().error(
+                    "Could not invert camera intrinsics matrix. Cannot"
+                    "project FOV on ground."
+                )
+                return None
 
-                # Convert to normalized image coordinates
-                d_img = np.array([u, v, 1])
+            # Convert to normalized image coordinates and then to direction in
+            # ENU frame for all points with a single matrix product
+            d_img = np.column_stack((img_points, np.ones(len(img_points))))
+            d_enu = d_img @ (R @ intrinsics_inv).T
 
-                try:
-                    d_cam = np.linalg.inv(intrinsics) @ d_img
-                except np.linalg.LinAlgError as _:  # noqa: F841
-                    self.get_logger().error(
-                        "Could not invert camera intrinsics matrix. Cannot"
-                        "project FOV on ground."
-                    )
-                    return None
+            # Find intersection with ground plane
+            t = -C[2] / d_enu[:, 2]
+            ground_points = C + t[:, np.newaxis] * d_enu
 
-                # Convert direction to ENU frame
-                d_enu = R @ d_cam
-
-                # Find intersection with ground plane
-                t = -C[2] / d_enu[2]
-                intersection = C + t * d_enu
-
-                ground_points.append(intersection[:2])
-
-            return np.vstack(ground_points)
+            return ground_points[:, :2]
 
         @narrow_types(self)
         def _enu_to_latlon(
@@ -224,18 +218,14 @@ class BBoxNode(Node):
             :return: Same bounding box in WGS 84 coordinates
             """
 
-            def _determine_utm_zone(longitude):
-                """Determine the UTM zone for a given longitude."""
-                return int((longitude + 180) / 6) + 1
-
             # Define the UTM zone and conversion
-            proj_latlon = pyproj.Proj(proj="latlong", datum="WGS84")
-            utm_zone = _determine_utm_zone(navsatfix.longitude)
-            proj_utm = pyproj.Proj(proj="utm", zone=utm_zone, datum="WGS84")
+            to_utm, from_utm = _utm_transformers(
+                _determine_utm_zone(navsatfix.longitude)
+            )
 
             # Convert origin to UTM
-            origin_x, origin_y = pyproj.transform(
-                proj_latlon, proj_utm, navsatfix.longitude, navsatfix.latitude
+            origin_x, origin_y = to_utm.transform(
+                navsatfix.longitude, navsatfix.latitude
             )
 
             # Add ENU offsets to the UTM origin
@@ -243,7 +233,7 @@ class BBoxNode(Node):
             utm_y = origin_y + bbox_coords[:, 1]
 
             # Convert back to lat/lon
-            lon, lat = pyproj.transform(proj_utm, proj_latlon, utm_x, utm_y)
+            lon, lat = from_utm.transform(utm_x, utm_y)
 
             latlon_coords = np.column_stack((lon, lat))
             assert latlon_coords.shape == bbox_coords.shape
@@ -463,3 +453,28 @@ class BBoxNode(Node):
         """:term:`Camera` :term:`FRD` :term:`orientation`, or None if not available
         or too old
         """
+
+
+def _determine_utm_zone(longitude: float) -> int:
+    """Determine the UTM zone for a given longitude."""
+    return int((longitude + 180) / 6) + 1
+
+
+@lru_cache(maxsize=64)
+def _utm_transformers(
+    utm_zone: int,
+) -> Tuple[pyproj.Transformer, pyproj.Transformer]:
+    """Returns transformers from WGS 84 to the given UTM zone and back
+
+    Creating the transformers is expensive compared to using them and the UTM
+    zone rarely changes, so they are cached per zone.
+
+    :param utm_zone: UTM zone number
+    :return: Tuple of WGS 84 to UTM and UTM to WGS 84 transformers
+    """
+    proj_latlon = pyproj.Proj(proj="latlong", datum="WGS84")
+    proj_utm = pyproj.Proj(proj="utm", zone=utm_zone, datum="WGS84")
+    return (
+        pyproj.Transformer.from_proj(proj_latlon, proj_utm),
+        pyproj.Transformer.from_proj(proj_utm, proj_latlon),
+    )
@@ -52,6 +52,15 @@ from ..constants import (
     TRANSFORM_NODE_NAME,
 )
 
+_DIST_COEFFS_ZERO = np.zeros((4, 1))
+"""Distortion coefficients for :func:`cv2.solvePnPRansac`, allocated once
+since the images are assumed rectified"""
+_DIST_COEFFS_ZERO.setflags(write=False)
+
+_CAMERA_POSITION_SIGN = np.array((-1.0, -1.0, 1.0))
+"""Signs applied to the rotated PnP translation vector to get camera position"""
+_CAMERA_POSITION_SIGN.setflags(write=False)
+
 
 class PoseNode(Node):
     """Solves the keypoint matching and :term:`PnP` problems and publishes the
@@ -144,10 +153,10 @@ class PoseNode(Node):
             )
             return None
 
-        camera_pos = (-r.T @ t).squeeze()
-        camera_pos[2] = -camera_pos[
-            2
-        ]  # todo: implement cleaner way of getting camera position right
+        # Camera position is -r.T @ t with the z-axis flipped, both sign flips
+        # are folded into a single broadcast multiplication
+        # todo: implement cleaner way of getting camera position right
+        camera_pos = _CAMERA_POSITION_SIGN * (r.T @ t).squeeze()
 
         # TODO: implicit assumption that image message here has timestamp in system time
         time_reference = self.time_reference
@@ -224,14 +233,11 @@ class PoseNode(Node):
             :term:`elevation reference`, and the last two channels combined
             represent the 16-bit :term:`elevation reference`.
         """
-        # Convert the ROS Image message to an OpenCV image
-        full_image_cv = self._cv_bridge.imgmsg_to_cv2(
-            image_quad, desired_encoding="passthrough"
-        )
-
         # Check that the image has 4 channels
-        channels = full_image_cv.shape[2]
-        assert channels == 4, "The image must have 4 channels"
+        assert image_quad.encoding == "8UC4", "The image must have 4 channels"
+
+        # View the ROS Image message data as a numpy array without copying
+        full_image_cv = messaging.image_to_array(image_quad, 4)
 
         # Extract individual channels
         query_img = full_image_cv[:, :, 0]
@@ -321,12 +327,11 @@ class PoseNode(Node):
     @staticmethod
     def _compute_pose(mkp2_3d, mkp_qry, k_matrix):
         """Computes :term:`pose` using :func:`cv2.solvePnPRansac`"""
-        dist_coeffs = np.zeros((4, 1))
         _, r, t, _ = cv2.solvePnPRansac(
             mkp2_3d,
             mkp_qry,
             k_matrix,
-            dist_coeffs,
+            _DIST_COEFFS_ZERO,
             useExtrinsicGuess=False,
             iterationsCount=10,
         )
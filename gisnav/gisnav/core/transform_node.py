@@ -30,14 +30,16 @@ image based on :term:`vehicle` heading, and then cropping it based on the
         camera_pose -->|geometry_msgs/PoseStamped| TransformNode
         pnp_image -->|sensor_msgs/Image| PnPNode:::hidden
 """
-from copy import deepcopy
+import math
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Final, Optional, Tuple
 
 import cv2
 import numpy as np
 import rclpy
 import tf2_ros
-import tf_transformations
 from cv_bridge import CvBridge
 from geometry_msgs.msg import TransformStamped
 from rcl_interfaces.msg import ParameterDescriptor
@@ -77,6 +79,15 @@ class TransformNode(Node):
     _ROS_PARAM_DESCRIPTOR_READ_ONLY: Final = ParameterDescriptor(read_only=True)
     """A read only ROS parameter descriptor"""
 
+    _ROTATION_RESOLUTION_DEGREES: Final = 0.5
+    """Resolution the reference image rotation is rounded to so that the
+    rotated reference image and affine transformations can be reused between
+    frames (well below keypoint matcher rotation sensitivity)"""
+
+    _ROTATED_ORTHOIMAGE_CACHE_SIZE: Final = 8
+    """Maximum number of rotated and cropped :term:`orthoimage` stacks to keep
+    in memory for the current orthoimage"""
+
     def __init__(self, *args, **kwargs) -> None:
         """Class initializer
 
@@ -88,6 +99,20 @@ class TransformNode(Node):
         # Converts image_raw to cv2 compatible image
         self._cv_bridge = CvBridge()
 
+        # Rotated and cropped orthoimage stacks for the orthoimage identified
+        # by the key, see :meth:`._get_rotated_orthoimage_stack`
+        self._orthoimage_key: Optional[Tuple[int, int, int, int]] = None
+        self._orthoimage_planes: Optional[Tuple[Optional[np.ndarray], ...]] = None
+        self._rotated_orthoimage_stacks: OrderedDict[
+            Tuple[float, Tuple[int, int]], np.ndarray
+        ] = OrderedDict()
+
+        # Warps the orthoimage planes concurrently, one worker per plane
+        self._warp_executor = ThreadPoolExecutor(max_workers=3)
+
+        # Reusable buffer for the outgoing query and orthoimage stack
+        self._pnp_image_stack: Optional[np.ndarray] = None
+
         # Calling these decorated properties the first time will setup
         # subscriptions to the appropriate ROS topics
         self.orthoimage
@@ -168,87 +193,55 @@ class TransformNode(Node):
             parent_frame_id: FrameID = orthoimage.header.frame_id
             assert parent_frame_id == "reference"
 
-            query_img = self._cv_bridge.imgmsg_to_cv2(image, desired_encoding="mono8")
-
-            orthoimage_stack = self._cv_bridge.imgmsg_to_cv2(
-                orthoimage, desired_encoding="passthrough"
-            )
-
-            assert orthoimage_stack.shape[2] == 3, (
-                f"Orthoimage stack channel count was {orthoimage_stack.shape[2]} "
-                f"when 3 was expected (one channel for 8-bit grayscale reference "
-                f"image and two 8-bit channels for 16-bit elevation reference)"
-            )
+            # Read grayscale query image directly from the message buffer if
+            # possible, other encodings need conversion
+            if image.encoding == "mono8":
+                query_img = messaging.image_to_array(image, 1)[:, :, 0]
+            else:
+                query_img = self._cv_bridge.imgmsg_to_cv2(
+                    image, desired_encoding="mono8"
+                )
 
             # Rotate and crop orthoimage stack
             # TODO: implement this part better
             camera_yaw_degrees = messaging.extract_yaw(transform.rotation)
             camera_roll_degrees = messaging.extract_roll(transform.rotation)
             rotation = camera_yaw_degrees + camera_roll_degrees
+            rotation = self._ROTATION_RESOLUTION_DEGREES * round(
+                rotation / self._ROTATION_RESOLUTION_DEGREES
+            )
             crop_shape: Tuple[int, int] = query_img.shape[0:2]
-            orthoimage_rotated_stack = self._rotate_and_crop_center(
-                orthoimage_stack, rotation, crop_shape
+            affine_3d, q, rotation_matrix = _build_affine(
+                orthoimage.height, orthoimage.width, rotation, *crop_shape
             )
-
-            # Add query image on top to complete full image stack
-            pnp_image_stack = np.dstack((query_img, orthoimage_rotated_stack))
-
-            pnp_image_msg = self._cv_bridge.cv2_to_imgmsg(
-                pnp_image_stack, encoding="passthrough"
+            orthoimage_rotated_stack = self._get_rotated_orthoimage_stack(
+                orthoimage, rotation, rotation_matrix, crop_shape
             )
 
+            # Add query image on top to complete full image stack. The stack is
+            # written into a buffer that is reused between frames instead of
+            # allocating a new one with np.dstack (the buffer is copied into
+            # the outgoing message so it can be safely overwritten, encoding is
+            # the same as cv_bridge would use for passthrough)
+            stack_shape = (*crop_shape, 4)
+            if (
+                self._pnp_image_stack is None
+                or self._pnp_image_stack.shape != stack_shape
+            ):
+                self._pnp_image_stack = np.empty(stack_shape, dtype=np.uint8)
+            np.copyto(self._pnp_image_stack[:, :, 0], query_img)
+            np.copyto(self._pnp_image_stack[:, :, 1:], orthoimage_rotated_stack)
+
+            pnp_image_msg = messaging.array_to_image(self._pnp_image_stack, "8UC4")
+
             # The child frame is the 'world' frame of the PnP problem as
             # defined here: https://docs.opencv.org/4.x/d5/d1f/calib3d_solvePnP.html
             child_frame_id: FrameID = "world"
             pnp_image_msg.header.stamp = image.header.stamp
             pnp_image_msg.header.frame_id = child_frame_id
 
-            center = (orthoimage_stack.shape[0] // 2, orthoimage_stack.shape[1] // 2)
-
-            cx, cy = center[0], center[1]
-            dx = cx - crop_shape[1] / 2
-            dy = cy - crop_shape[0] / 2
-
-            # Compute transformation (rotation around center + crop)
-            theta = np.radians(rotation)
-
-            # Translation to origin
-            T1 = np.array([[1, 0, -cx], [0, 1, -cy], [0, 0, 1]])
-
-            # Rotation
-            R = np.array(
-                [
-                    [np.cos(theta), -np.sin(theta), 0],
-                    [np.sin(theta), np.cos(theta), 0],
-                    [0, 0, 1],
-                ]
-            )
-
-            # Translation back from origin
-            T2 = np.array([[1, 0, cx], [0, 1, cy], [0, 0, 1]])
-
-            # Center-crop translation
-            T3 = np.array([[1, 0, -dx], [0, 1, -dy], [0, 0, 1]])
-
-            # Combined affine matrix: reference coordinate to world coordinate
-            affine_2d = T3 @ T2 @ R @ T1
-
-            # Convert to 4x4 matrix
-            affine_3d = np.eye(4)
-            affine_3d[0:2, 0:2] = affine_2d[0:2, 0:2]  # Copy rotation
-            affine_3d[0:2, 3] = affine_2d[0:2, 2]  # Copy translation
-
             translation = affine_3d[:3, 3]
 
-            try:
-                q = tf_transformations.quaternion_from_matrix(affine_3d)
-            except np.linalg.LinAlgError:
-                self.get_logger().warning(
-                    "_pnp_image: Could not compute quaternion from estimated rotation. "
-                    "Returning None."
-                )
-                return None
-
             transform_camera = messaging.create_transform_msg(
                 pnp_image_msg.header.stamp,
                 child_frame_id,
@@ -265,11 +258,16 @@ class TransformNode(Node):
             # the same timestamps).
             # TODO: remove this assumption or make the design less brittle in some
             #  other way
-            transform_camera_stamped = deepcopy(transform_camera)
-            transform_camera_stamped.child_frame_id = (
-                f"{transform_camera.child_frame_id}"
+            # The message is created again rather than deep copied, which is
+            # much slower for ROS messages
+            transform_camera_stamped = messaging.create_transform_msg(
+                pnp_image_msg.header.stamp,
+                child_frame_id,
+                f"{parent_frame_id}"
                 f"_{orthoimage.header.stamp.sec}"
-                f"_{orthoimage.header.stamp.nanosec}"
+                f"_{orthoimage.header.stamp.nanosec}",
+                q,
+                translation,
             )
             self.broadcaster.sendTransform([transform_camera, transform_camera_stamped])
 
@@ -308,36 +306,203 @@ class TransformNode(Node):
             transform,
         )
 
+    def _get_rotated_orthoimage_stack(
+        self,
+        orthoimage: Image,
+        rotation: float,
+        rotation_matrix: np.ndarray,
+        crop_shape: Tuple[int, int],
+    ) -> np.ndarray:
+        """Returns the rotated and cropped :term:`orthoimage` stack
+
+        The orthoimage only changes when :class:`.GISNode` publishes a new one
+        and vehicle heading changes slowly, so the same rotated stack is
+        expected to be used for multiple query images. Stacks are cached per
+        orthoimage (identified by its timestamp and dimensions) and the cache
+        is cleared when a new orthoimage is received.
+
+        The orthoimage stack is split into contiguous 8-bit planes once per
+        orthoimage and each plane is warped separately so that OpenCV can use
+        its fastest single channel (8UC1) warp kernels. Planes that are all
+        zero are not warped.
+
+        :param orthoimage: Orthoimage stack message
+        :param rotation: Rotation in degrees, rounded to
+            :attr:`._ROTATION_RESOLUTION_DEGREES`
+        :param rotation_matrix: 2x3 rotation matrix matching the rotation as
+            returned by :func:`._build_affine`
+        :param crop_shape: Tuple (height, width) of the query image
+        :return: Rotated and cropped orthoimage stack
+        """
+        orthoimage_key = (
+            orthoimage.header.stamp.sec,
+            orthoimage.header.stamp.nanosec,
+            orthoimage.height,
+            orthoimage.width,
+        )
+        if orthoimage_key != self._orthoimage_key:
+            self._rotated_orthoimage_stacks.clear()
+            self._orthoimage_planes = None
+            self._orthoimage_key = orthoimage_key
+
+        key = (rotation, crop_shape)
+        rotated_stack = self._rotated_orthoimage_stacks.get(key)
+        if rotated_stack is not None:
+            self._rotated_orthoimage_stacks.move_to_end(key)
+            return rotated_stack
+
+        if self._orthoimage_planes is None:
+            assert orthoimage.encoding == "8UC3", (
+                f"Orthoimage stack encoding was {orthoimage.encoding} "
+                f"when 8UC3 was expected (one channel for 8-bit grayscale reference "
+                f"image and two 8-bit channels for 16-bit elevation reference)"
+            )
+
+            orthoimage_stack = messaging.image_to_array(orthoimage, 3)
+
+            # GISNode publishes an 8-bit DEM padded with an all-zero high
+            # byte plane. All-zero planes warp to all-zero output (the border
+            # is also zero) so they are not stored or warped at all.
+            planes = (
+                np.ascontiguousarray(orthoimage_stack[:, :, i], dtype=np.uint8)
+                for i in range(orthoimage_stack.shape[2])
+            )
+            self._orthoimage_planes = tuple(
+                plane if plane.any() else None for plane in planes
+            )
+
+        # Elevation bytes must not be interpolated: bilinear interpolation of
+        # the high and low bytes separately does not produce a valid 16-bit
+        # value and elevation noise swamps any sub-pixel accuracy anyway. The
+        # planes are independent and OpenCV releases the GIL so they are
+        # warped concurrently.
+        interpolations = (cv2.INTER_LINEAR, cv2.INTER_NEAREST, cv2.INTER_NEAREST)
+        futures = [
+            self._warp_executor.submit(
+                self._rotate_and_crop_center,
+                plane,
+                rotation_matrix,
+                crop_shape,
+                interpolation,
+            )
+            if plane is not None
+            else None
+            for plane, interpolation in zip(self._orthoimage_planes, interpolations)
+        ]
+        rotated_stack = cv2.merge(
+            [
+                future.result()
+                if future is not None
+                else np.zeros(crop_shape, dtype=np.uint8)
+                for future in futures
+            ]
+        )
+        # Shared between frames so must not be modified by the caller
+        rotated_stack.setflags(write=False)
+
+        self._rotated_orthoimage_stacks[key] = rotated_stack
+        if len(self._rotated_orthoimage_stacks) > self._ROTATED_ORTHOIMAGE_CACHE_SIZE:
+            self._rotated_orthoimage_stacks.popitem(last=False)
+
+        return rotated_stack
+
     @staticmethod
     def _rotate_and_crop_center(
-        image: np.ndarray, angle_degrees: float, shape: Tuple[int, int]
+        image: np.ndarray,
+        rotation_matrix: np.ndarray,
+        shape: Tuple[int, int],
+        interpolation: int = cv2.INTER_LINEAR,
     ):
         """Rotates an image around its center axis and then crops it to the
         specified shape.
 
+        The crop is included in the rotation matrix so that the image is warped
+        directly into an output of the cropped shape, i.e. the warp does not
+        have to write the full rotated image only for most of it to be
+        discarded.
+
         :param image: Numpy array representing the image.
-        :param angle: Rotation angle in degrees.
+        :param rotation_matrix: 2x3 rotation and center-crop matrix as
+            returned by :func:`._build_affine`
         :param shape: Tuple (height, width) representing the desired shape
             after cropping.
+        :param interpolation: OpenCV interpolation method
         :return: Cropped and rotated image.
         """
-        # Image dimensions
-        h, w = image.shape[:2]
-
-        # Center of rotation
-        center = (w // 2, h // 2)
-
-        # Calculate the rotation matrix
-        rotation_matrix = cv2.getRotationMatrix2D(center, angle_degrees, 1.0)
-
-        # Perform the rotation
-        rotated_image = cv2.warpAffine(image, rotation_matrix, (w, h))
-
-        # Calculate the cropping coordinates
-        x = center[0] - shape[1] // 2
-        y = center[1] - shape[0] // 2
+        return cv2.warpAffine(
+            image, rotation_matrix, (shape[1], shape[0]), flags=interpolation
+        )
 
-        # Perform the cropping
-        cropped_image = rotated_image[y : y + shape[0], x : x + shape[1]]
 
-        return cropped_image
+@lru_cache(maxsize=512)
+def _build_affine(
+    height: int, width: int, degrees: float, crop_height: int, crop_width: int
+) -> Tuple[np.ndarray, Tuple[float, float, float, float], np.ndarray]:
+    """Returns the affine transformations for rotating the reference image
+    around its center and then center-cropping it to the query image shape
+
+    The result depends only on the image shapes and the rotation, and the
+    vehicle heading changes slowly, so the matrices are cached and shared
+    between frames. The returned arrays are set read-only for this reason.
+
+    :param height: Reference image height
+    :param width: Reference image width
+    :param degrees: Rotation in degrees (rounded by caller to improve cache
+        hit rate)
+    :param crop_height: Query image height
+    :param crop_width: Query image width
+    :return: Tuple of 4x4 reference to world affine matrix, its rotation as
+        a quaternion in (x, y, z, w) format, and 2x3 rotation and center-crop
+        matrix for :func:`cv2.warpAffine`
+    """
+    cx, cy = height // 2, width // 2
+
+    # Composition of translation to origin, rotation, translation back from
+    # origin, and center-crop translation written out in scalar form to avoid
+    # the NumPy overhead of assembling and multiplying tiny matrices
+    a = math.cos(math.radians(degrees))
+    b = math.sin(math.radians(degrees))
+
+    # Combined affine matrix: reference coordinate to world coordinate
+    affine_3d = np.empty((4, 4))
+    affine_3d[0, 0] = a
+    affine_3d[0, 1] = -b
+    affine_3d[0, 2] = 0.0
+    affine_3d[0, 3] = crop_width / 2 - a * cx + b * cy
+    affine_3d[1, 0] = b
+    affine_3d[1, 1] = a
+    affine_3d[1, 2] = 0.0
+    affine_3d[1, 3] = crop_height / 2 - b * cx - a * cy
+    affine_3d[2, 0] = 0.0
+    affine_3d[2, 1] = 0.0
+    affine_3d[2, 2] = 1.0
+    affine_3d[2, 3] = 0.0
+    affine_3d[3, 0] = 0.0
+    affine_3d[3, 1] = 0.0
+    affine_3d[3, 2] = 0.0
+    affine_3d[3, 3] = 1.0
+    affine_3d.setflags(write=False)
+
+    # The rotation is around the z-axis only so the quaternion can be written
+    # out directly instead of decomposing the matrix with
+    # tf_transformations.quaternion_from_matrix (same w >= 0 convention)
+    half_theta = math.radians(degrees) / 2
+    q = (0.0, 0.0, math.sin(half_theta), math.cos(half_theta))
+    if q[3] < 0:
+        q = (0.0, 0.0, -q[2], -q[3])
+
+    # Rotation matrix for warping the reference image, equivalent to
+    # cv2.getRotationMatrix2D followed by a translation of the crop origin to
+    # the output origin (note cv2 uses (x, y) i.e. (width, height) ordering)
+    px, py = width // 2, height // 2
+    crop_x, crop_y = px - crop_width // 2, py - crop_height // 2
+    rotation_matrix = np.empty((2, 3))
+    rotation_matrix[0, 0] = a
+    rotation_matrix[0, 1] = b
+    rotation_matrix[0, 2] = (1 - a) * px - b * py - crop_x
+    rotation_matrix[1, 0] = -b
+    rotation_matrix[1, 1] = a
+    rotation_matrix[1, 2] = b * px + (1 - a) * py - crop_y
+    rotation_matrix.setflags(write=False)
+
+    return affine_3d, q, rotation_matrix